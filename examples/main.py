@@ -48,6 +48,7 @@ async def lifespan(app: FastAPI):
         redis=r,
     )
     yield
+    await admin_app.shutdown()
 
 
 def create_app():
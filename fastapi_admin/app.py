@@ -1,14 +1,16 @@
-from typing import Dict, List, Optional, Type
+from typing import Dict, List, Optional, Tuple, Type
 
 import redis.asyncio as redis
 from fastapi import FastAPI
+from jinja2 import BytecodeCache
 from pydantic import HttpUrl
 from starlette.middleware.base import BaseHTTPMiddleware
-from tortoise import Model
+from tortoise import Model, Tortoise
 
 from fastapi_admin import i18n
 
 from . import middlewares, template
+from .jobs import JobRunner
 from .providers import Provider
 from .resources import Dropdown
 from .resources import Model as ModelResource
@@ -25,6 +27,10 @@ class FastAPIAdmin(FastAPI):
     redis: redis.Redis
     language_switch: bool = True
     favicon_url: Optional[HttpUrl] = None
+    asgi_middlewares: bool = False
+    jobs: Optional[JobRunner] = None
+    menu: Optional[List[dict]] = None
+    _resource_index: Optional[Dict[str, Tuple[Type[Model], Optional[Type[Resource]]]]] = None
 
     async def configure(
         self,
@@ -34,18 +40,53 @@ class FastAPIAdmin(FastAPI):
         language_switch: bool = True,
         admin_path: str = "/admin",
         template_folders: Optional[List[str]] = None,
+        locale_folders: Optional[List[str]] = None,
         providers: Optional[List[Provider]] = None,
         favicon_url: Optional[HttpUrl] = None,
+        template_bytecode_cache: Optional[BytecodeCache] = None,
+        precompile_templates: bool = False,
+        asgi_middlewares: bool = False,
+        jobs: Optional[JobRunner] = None,
     ):
+        """
+        :param locale_folders: extra catalog folders, laid out like `fastapi_admin/locales`
+        :param asgi_middlewares: use pure ASGI middlewares instead of `BaseHTTPMiddleware`
+        :param jobs: runner of background actions, which is started here and stopped by `shutdown`
+        """
         self.redis = redis
-        i18n.set_locale(default_locale)
+        if locale_folders:
+            i18n.add_locale_folder(*locale_folders)
+        i18n.set_default_locale(default_locale)
         self.admin_path = admin_path
         self.language_switch = language_switch
         self.logo_url = logo_url
         self.favicon_url = favicon_url
         if template_folders:
             template.add_template_folder(*template_folders)
+        if template_bytecode_cache:
+            if isinstance(template_bytecode_cache, template.RedisBytecodeCache):
+                await template_bytecode_cache.load()
+            template.set_bytecode_cache(template_bytecode_cache)
+        self.asgi_middlewares = asgi_middlewares
+        if asgi_middlewares:
+            self.add_middleware(middlewares.LanguageProcessorMiddleware)
+        else:
+            self.add_middleware(BaseHTTPMiddleware, dispatch=middlewares.language_processor)
         await self._register_providers(providers)
+        if jobs:
+            self.jobs = jobs
+            await jobs.start(redis)
+            self.add_event_handler("shutdown", self.shutdown)
+        if precompile_templates:
+            template.precompile_templates()
+
+    async def shutdown(self):
+        """
+        Stop background workers. Lifespan events don't reach mounted apps,
+        so call it on shutdown of the app which the admin is mounted to.
+        """
+        if self.jobs:
+            await self.jobs.stop()
 
     async def _register_providers(self, providers: Optional[List[Provider]] = None):
         for p in providers or []:
@@ -57,6 +98,7 @@ class FastAPIAdmin(FastAPI):
 
     def _set_model_resource(self, resource: Type[Resource]):
         if issubclass(resource, ModelResource):
+            resource.clear_schema()
             self.model_resources[resource.model] = resource
         elif issubclass(resource, Dropdown):
             for r in resource.resources:
@@ -65,15 +107,32 @@ class FastAPIAdmin(FastAPI):
     def register(self, resource: Type[Resource]):
         self._set_model_resource(resource)
         self.resources.append(resource)
+        self.menu = None
+        self._resource_index = None
 
     def get_model_resource(self, model: Type[Model]):
         r = self.model_resources.get(model)
         return r() if r else None
 
+    def resolve_resource(self, name: str) -> Tuple[Optional[Type[Model]], Optional[Type[Resource]]]:
+        """
+        Get model and its resource by the lowercase model name used in url.
+        The index is built once Tortoise is initialised and rebuilt after registering resources.
+        """
+        index = self._resource_index
+        if index is None:
+            if not Tortoise.apps:
+                return None, None
+            index = {}
+            for models in Tortoise.apps.values():
+                for model_name, model in models.items():
+                    index.setdefault(model_name.lower(), (model, self.model_resources.get(model)))
+            self._resource_index = index
+        return index.get(name, (None, None))
+
 
 app = FastAPIAdmin(
     title="FastAdmin",
     description="A fast admin dashboard based on fastapi and tortoise-orm with tabler ui.",
 )
-app.add_middleware(BaseHTTPMiddleware, dispatch=middlewares.language_processor)
 app.include_router(router)
@@ -11,3 +11,7 @@ DATE_FORMAT_MOMENT = "YYYY-MM-DD"
 CAPTCHA_ID = "captcha:{captcha_id}"
 LOGIN_ERROR_TIMES = "login_error_times:{ip}"
 LOGIN_USER = "login_user:{token}"
+LIST_COUNT = "list_count:{resource}:{params}"
+FILTER_OPTIONS = "filter_options:{filter}:{model}:{name}"
+JOB = "job:{job_id}"
+JOB_QUEUE = "job_queue"
@@ -1,29 +1,26 @@
 from typing import List, Optional, Type
 
-from fastapi import Depends, HTTPException
+from fastapi import HTTPException
 from fastapi.params import Path
 from starlette.requests import Request
 from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_404_NOT_FOUND
-from tortoise import Tortoise
 
 from fastapi_admin.exceptions import InvalidResource
 from fastapi_admin.resources import Dropdown, Link, Model, Resource
 
 
-def get_model(resource: Optional[str] = Path(...)):
+def get_model(request: Request, resource: Optional[str] = Path(...)):
     if not resource:
         return
-    for app, models in Tortoise.apps.items():
-        models = {key.lower(): val for key, val in models.items()}
-        model = models.get(resource)
-        if model:
-            return model
+    model, _ = request.app.resolve_resource(resource)
+    return model
 
 
-async def get_model_resource(request: Request, model=Depends(get_model)):
-    model_resource = request.app.get_model_resource(model)  # type:Model
-    if not model_resource:
+async def get_model_resource(request: Request):
+    _, resource_cls = request.app.resolve_resource(request.path_params["resource"])
+    if not resource_cls:
         raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    model_resource = resource_cls()  # type:Model
     actions = await model_resource.get_actions(request)
     bulk_actions = await model_resource.get_bulk_actions(request)
     toolbar_actions = await model_resource.get_toolbar_actions(request)
@@ -57,8 +54,10 @@ def _get_resources(resources: List[Type[Resource]]):
 
 
 def get_resources(request: Request) -> List[dict]:
-    resources = request.app.resources
-    return _get_resources(resources)
+    app = request.app
+    if app.menu is None:
+        app.menu = _get_resources(app.resources)
+    return app.menu
 
 
 def get_redis(request: Request):
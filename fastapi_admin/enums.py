@@ -12,3 +12,38 @@ class Method(StrEnum):
     DELETE = "DELETE"
     PUT = "PUT"
     PATCH = "PATCH"
+
+
+class Pagination(StrEnum):
+    OFFSET = "offset"
+    KEYSET = "keyset"
+
+
+class CountStrategy(StrEnum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+    HAS_MORE = "has_more"
+
+
+class QueryMode(StrEnum):
+    SEQUENTIAL = "sequential"
+    CONCURRENT = "concurrent"
+    WINDOW = "window"
+
+
+class ExportFormat(StrEnum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+class ImportFormat(StrEnum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+class JobStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
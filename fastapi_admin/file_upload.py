@@ -1,46 +1,218 @@
+import asyncio
+import hashlib
+import importlib.util
+import io
+import mimetypes
 import os
-from typing import Callable, List, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Union
 
-import aiofiles
 from starlette.datastructures import UploadFile
 
 from fastapi_admin.exceptions import FileExtNotAllowed, FileMaxSizeLimit
+from fastapi_admin.storages import LocalStorage, Storage
+
+_thumbnail_executor: Optional[Executor] = None
+
+
+def get_thumbnail_executor() -> Executor:
+    global _thumbnail_executor
+    if _thumbnail_executor is None:
+        _thumbnail_executor = ProcessPoolExecutor(max_workers=2)
+    return _thumbnail_executor
+
+
+def make_thumbnails(source: Union[str, bytes], sizes: List[int]) -> Dict[int, bytes]:
+    """
+    Resize the image to fit in each size, keeping its format and aspect ratio.
+    Run in a worker process, decoding and resizing are cpu bound.
+    :param source: path of the image, which is read in the worker, or its content
+    :param sizes:
+    """
+    from PIL import Image
+
+    ret = {}
+    with Image.open(source if isinstance(source, str) else io.BytesIO(source)) as image:
+        format_ = image.format
+        for size in sizes:
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size))
+            if format_ == "JPEG" and thumbnail.mode not in ("RGB", "L"):
+                thumbnail = thumbnail.convert("RGB")
+            buffer = io.BytesIO()
+            thumbnail.save(buffer, format=format_)
+            ret[size] = buffer.getvalue()
+    return ret
+
+
+def is_image(filename: str, content_type: Optional[str] = None) -> bool:
+    mimetype = mimetypes.guess_type(filename)[0] or content_type or ""
+    return mimetype.startswith("image/")
+
+
+def thumbnail_name(filename: str, size: int) -> str:
+    root, ext = os.path.splitext(filename)
+    return f"{root}.thumb{size}{ext}"
 
 
 class FileUpload:
     def __init__(
         self,
-        uploads_dir: str,
+        uploads_dir: Optional[str] = None,
         allow_extensions: Optional[List[str]] = None,
         max_size: int = 1024**3,
         filename_generator: Optional[Callable] = None,
         prefix: str = "/static/uploads",
+        chunk_size: int = 1024 * 1024,
+        storage: Optional[Storage] = None,
+        hash_content: bool = False,
+        thumbnail_sizes: Optional[List[int]] = None,
+        thumbnail_executor: Optional[Executor] = None,
     ):
+        """
+        :param chunk_size: bytes read from the upload and written to the file at once
+        :param storage: where files are saved, default `LocalStorage` of uploads_dir and prefix
+        :param hash_content: name files by sha256 of content, identical uploads are saved once
+        :param thumbnail_sizes: max width and height of thumbnails generated for images, need Pillow
+        :param thumbnail_executor: where thumbnails are generated, default a shared process pool
+        """
         self.max_size = max_size
         self.allow_extensions = allow_extensions
         self.uploads_dir = uploads_dir
         self.filename_generator = filename_generator
         self.prefix = prefix
+        self.chunk_size = chunk_size
+        if storage is None:
+            if uploads_dir is None:
+                raise ValueError("Either uploads_dir or storage is required")
+            storage = LocalStorage(uploads_dir, prefix)
+        self.storage = storage
+        self.hash_content = hash_content
+        if thumbnail_sizes and importlib.util.find_spec("PIL") is None:
+            raise ImportError(
+                "Pillow is required for thumbnails, install it by `pip install pillow`"
+            )
+        self.thumbnail_sizes = thumbnail_sizes or []
+        self.thumbnail_executor = thumbnail_executor
+        self._thumbnails: Set[str] = set()
 
     async def save_file(self, filename: str, content: bytes):
-        file = os.path.join(self.uploads_dir, filename)
-        async with aiofiles.open(file, "wb") as f:
-            await f.write(content)
-        return os.path.join(self.prefix, filename)
+        async def chunks():
+            yield content
+
+        await self.storage.save(filename, chunks())
+        return self.storage.url(filename)
+
+    async def read_chunks(self, file: UploadFile) -> AsyncIterator[bytes]:
+        """
+        Read the upload by chunks, raise once it exceeds max_size
+        """
+        file_size = 0
+        while True:
+            chunk = await file.read(self.chunk_size)
+            if not chunk:
+                break
+            file_size += len(chunk)
+            if file_size > self.max_size:
+                raise FileMaxSizeLimit(f"File size exceeds max size {self.max_size}")
+            yield chunk
+
+    async def save_upload(self, filename: str, file: UploadFile):
+        """
+        Stream the upload to the storage by chunks, nothing is saved if it's too large
+        """
+        await self.storage.save(filename, self.read_chunks(file))
+        return self.storage.url(filename)
+
+    async def generate_thumbnails(self, filename: str) -> bool:
+        """
+        Generate thumbnails of all sizes in the executor, so the event loop is not blocked.
+        Files on local disk are read by the worker, others are read from the storage.
+        Return False if the file is not an image Pillow can handle.
+        """
+        path = self.storage.path(filename)
+        source: Union[str, bytes] = path if path is not None else await self.storage.read(filename)
+        loop = asyncio.get_running_loop()
+        executor = self.thumbnail_executor or get_thumbnail_executor()
+        try:
+            thumbnails = await loop.run_in_executor(
+                executor, make_thumbnails, source, self.thumbnail_sizes
+            )
+        except Exception:
+            return False
+        for size, thumbnail in thumbnails.items():
+            name = thumbnail_name(filename, size)
+            await self.save_file(name, thumbnail)
+            self._thumbnails.add(name)
+        return True
+
+    def get_filename(self, url: str) -> Optional[str]:
+        """
+        Name in the storage of the file url, None if it's not a safe name of the storage
+        """
+        base = self.storage.url("")
+        if not url.startswith(base):
+            return None
+        filename = url.replace(base, "", 1)
+        if (
+            not filename
+            or os.path.isabs(filename)
+            or os.path.normpath(filename) != filename
+            or filename.startswith("..")
+        ):
+            return None
+        return filename
+
+    async def get_thumbnail_url(self, url: str, size: int) -> str:
+        """
+        Url of the thumbnail of the file url, which is generated on first access for files
+        uploaded before thumbnails were enabled. Fallback to the file url itself.
+        """
+        filename = self.get_filename(url)
+        if size not in self.thumbnail_sizes or filename is None:
+            return url
+        name = thumbnail_name(filename, size)
+        if name in self._thumbnails:
+            return self.storage.url(name)
+        if await self.storage.exists(name):
+            self._thumbnails.add(name)
+            return self.storage.url(name)
+        if not is_image(filename) or not await self.storage.exists(filename):
+            return url
+        if await self.generate_thumbnails(filename):
+            return self.storage.url(name)
+        return url
+
+    async def hash_upload(self, file: UploadFile) -> str:
+        sha256 = hashlib.sha256()
+        async for chunk in self.read_chunks(file):
+            sha256.update(chunk)
+        await file.seek(0)
+        return sha256.hexdigest()
+
+    def check_extension(self, filename: str):
+        if self.allow_extensions and not any(
+            filename.endswith(ext) for ext in self.allow_extensions
+        ):
+            raise FileExtNotAllowed(
+                f"File ext of {filename} is not allowed of {self.allow_extensions}"
+            )
 
     async def upload(self, file: UploadFile):
-        if self.filename_generator:
+        self.check_extension(file.filename or "")
+        file_size = getattr(file, "size", None)
+        if file_size is not None and file_size > self.max_size:
+            raise FileMaxSizeLimit(f"File size {file_size} exceeds max size {self.max_size}")
+        if self.hash_content:
+            # the upload is spooled, so it's cheap to read it twice
+            filename = await self.hash_upload(file) + os.path.splitext(file.filename or "")[1]
+            if await self.storage.exists(filename):
+                return self.storage.url(filename)
+        elif self.filename_generator:
             filename = self.filename_generator(file)
         else:
-            filename = file.filename
-        content = await file.read()
-        file_size = len(content)
-        if file_size > self.max_size:
-            raise FileMaxSizeLimit(f"File size {file_size} exceeds max size {self.max_size}")
-        if self.allow_extensions:
-            for ext in self.allow_extensions:
-                if filename.endswith(ext):
-                    raise FileExtNotAllowed(
-                        f"File ext {ext} is not allowed of {self.allow_extensions}"
-                    )
-        return await self.save_file(filename, content)
+            filename = os.path.basename(file.filename or "")
+        url = await self.save_upload(filename, file)
+        if self.thumbnail_sizes and is_image(filename, file.content_type):
+            await self.generate_thumbnails(filename)
+        return url
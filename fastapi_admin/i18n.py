@@ -1,27 +1,110 @@
 import os
+from contextvars import ContextVar
+from typing import Dict, List, Optional
 
 from babel.support import Translations
 
 from fastapi_admin.constants import BASE_DIR
 from fastapi_admin.template import templates
 
-TRANSLATIONS = {
-    "zh_CN": Translations.load(os.path.join(BASE_DIR, "locales"), locales=["zh_CN"]),
-    "en_US": Translations.load(os.path.join(BASE_DIR, "locales"), locales=["en_US"]),
-    "es_PY": Translations.load(os.path.join(BASE_DIR, "locales"), locales=["es_PY"]),
-    "fr_FR": Translations.load(os.path.join(BASE_DIR, "locales"), locales=["fr_FR"]),
-    "fa_IR": Translations.load(os.path.join(BASE_DIR, "locales"), locales=["fa_IR"]),
-}
+locale_folders: List[str] = [os.path.join(BASE_DIR, "locales")]
+TRANSLATIONS: Dict[str, Translations] = {}
+_locales: Optional[List[str]] = None
 
-translations = TRANSLATIONS.get("en_US")
+default_locale = "en_US"
+_locale: ContextVar[Optional[str]] = ContextVar("locale", default=None)
 
 
-def set_locale(locale: str):
-    global translations
-    translations = TRANSLATIONS.get(locale) or TRANSLATIONS.get("en_US")
-    templates.env.install_gettext_translations(translations)
-    translations.install(locale)
+def add_locale_folder(*folders: str):
+    """
+    Add catalog folders, their translations override the built-in ones
+    """
+    global _locales
+    locale_folders.extend(folders)
+    TRANSLATIONS.clear()
+    _locales = None
+
+
+def get_locales() -> List[str]:
+    """
+    Locales which have a catalog in any of the locale folders
+    """
+    global _locales
+    if _locales is None:
+        locales = set()
+        for folder in locale_folders:
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if os.path.isdir(os.path.join(folder, name, "LC_MESSAGES")):
+                    locales.add(name)
+        _locales = sorted(locales)
+    return _locales
+
+
+def load_translations(locale: str) -> Translations:
+    """
+    Load catalogs of the locale on first use, later folders override earlier ones
+    """
+    translations = TRANSLATIONS.get(locale)
+    if translations is None:
+        for folder in locale_folders:
+            catalog = Translations.load(folder, locales=[locale])
+            if not isinstance(catalog, Translations):
+                continue
+            if translations is None:
+                translations = catalog
+            else:
+                translations.merge(catalog)
+        if translations is None:
+            translations = Translations()
+        TRANSLATIONS[locale] = translations
+    return translations
+
+
+def set_default_locale(locale: str):
+    """
+    Locale used when the current context has none or an unknown one
+    """
+    global default_locale
+    default_locale = locale if locale in get_locales() else "en_US"
+
+
+def set_locale(locale: Optional[str]):
+    """
+    Set the locale of the current context only, so concurrent requests don't interfere
+    """
+    _locale.set(locale if locale in get_locales() else None)
+
+
+def get_locale() -> str:
+    return _locale.get() or default_locale
+
+
+def get_translations() -> Translations:
+    return load_translations(get_locale())
 
 
 def _(msg: str):
-    return translations.ugettext(msg)
+    return get_translations().ugettext(msg)
+
+
+def _gettext(message: str) -> str:
+    return get_translations().ugettext(message)
+
+
+def _ngettext(singular: str, plural: str, n: int) -> str:
+    return get_translations().ungettext(singular, plural, n)
+
+
+def _pgettext(context: str, message: str) -> str:
+    return get_translations().upgettext(context, message)
+
+
+def _npgettext(context: str, singular: str, plural: str, n: int) -> str:
+    return get_translations().unpgettext(context, singular, plural, n)
+
+
+templates.env.install_gettext_callables(  # type: ignore
+    _gettext, _ngettext, pgettext=_pgettext, npgettext=_npgettext
+)
@@ -0,0 +1,191 @@
+import asyncio
+import json
+import logging
+import time
+import traceback
+import uuid
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as redis
+
+from fastapi_admin import constants
+from fastapi_admin.enums import JobStatus
+from fastapi_admin.utils import TTLCache, import_string
+
+logger = logging.getLogger(__name__)
+
+
+class Job:
+    """
+    State of a job, passed to the job function to report progress
+    """
+
+    def __init__(
+        self,
+        runner: "JobRunner",
+        id: str,
+        name: str,
+        kwargs: Optional[Dict[str, Any]] = None,
+        status: JobStatus = JobStatus.PENDING,
+        progress: float = 0,
+        message: Optional[str] = None,
+        result: Any = None,
+        error: Optional[str] = None,
+        created_at: Optional[float] = None,
+        finished_at: Optional[float] = None,
+    ):
+        self.runner = runner
+        self.id = id
+        self.name = name
+        self.kwargs = kwargs or {}
+        self.status = JobStatus(status)
+        self.progress = progress
+        self.message = message
+        self.result = result
+        self.error = error
+        self.created_at = created_at or time.time()
+        self.finished_at = finished_at
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.SUCCESS, JobStatus.FAILED)
+
+    async def set_progress(self, progress: float, message: Optional[str] = None):
+        """
+        :param progress: percentage from 0 to 100
+        :param message:
+        """
+        self.progress = progress
+        self.message = message
+        await self.runner.save(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "kwargs": self.kwargs,
+            "status": self.status.value,
+            "progress": self.progress,
+            "message": self.message,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobRunner:
+    """
+    Run jobs by asyncio workers, jobs are queued in process or in redis of the app.
+    With redis, jobs can be submitted and watched from any process and run by the workers of any.
+    A job function is referenced by import path, it is an async function like
+    `async def func(job: Job, **kwargs)`, whose return value must be json serializable.
+    """
+
+    def __init__(self, workers: int = 2, use_redis: bool = False, result_ttl: int = 3600 * 24):
+        """
+        :param workers: count of asyncio workers of this process
+        :param use_redis: queue jobs and store their state in redis
+        :param result_ttl: seconds to keep the state of jobs
+        """
+        self.workers = workers
+        self.use_redis = use_redis
+        self.result_ttl = result_ttl
+        self.redis: Optional[redis.Redis] = None
+        self.jobs = TTLCache(maxsize=10000, ttl=result_ttl)
+        self.queue: Optional[asyncio.Queue] = None
+        self.tasks: List[asyncio.Task] = []
+
+    async def start(self, redis: redis.Redis):
+        self.redis = redis
+        self.queue = asyncio.Queue()
+        self.tasks = [asyncio.create_task(self.work()) for _ in range(self.workers)]
+
+    def get_redis(self) -> redis.Redis:
+        if self.redis is None:
+            raise RuntimeError("JobRunner is not started")
+        return self.redis
+
+    def get_queue(self) -> asyncio.Queue:
+        if self.queue is None:
+            raise RuntimeError("JobRunner is not started")
+        return self.queue
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    async def submit(self, name: str, **kwargs) -> Job:
+        """
+        Queue a job
+        :param name: import path of the job function
+        :param kwargs: json serializable keyword arguments of the job function
+        """
+        job = Job(self, uuid.uuid4().hex, name, kwargs)
+        await self.save(job)
+        if self.use_redis:
+            await self.get_redis().rpush(constants.JOB_QUEUE, job.id)
+        else:
+            self.get_queue().put_nowait(job.id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        if not self.use_redis:
+            return self.jobs.get(job_id)
+        data = await self.get_redis().get(constants.JOB.format(job_id=job_id))
+        if data is None:
+            return None
+        return Job(self, **json.loads(data))
+
+    async def save(self, job: Job):
+        if self.use_redis:
+            await self.get_redis().set(
+                constants.JOB.format(job_id=job.id),
+                json.dumps(job.to_dict(), default=str),
+                ex=self.result_ttl,
+            )
+        else:
+            self.jobs.set(job.id, job)
+
+    async def next_job_id(self) -> str:
+        if not self.use_redis:
+            return await self.get_queue().get()
+        while True:
+            item = await self.get_redis().blpop(constants.JOB_QUEUE, timeout=5)
+            if item:
+                job_id = item[1]
+                return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+    async def work(self):
+        while True:
+            try:
+                job = await self.get(await self.next_job_id())
+                if job:
+                    await self.run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # a redis error or a broken job entry must not kill the worker
+                logger.exception("Job worker error")
+                await asyncio.sleep(1)
+
+    async def run(self, job: Job):
+        job.status = JobStatus.RUNNING
+        await self.save(job)
+        try:
+            func = import_string(job.name)
+            job.result = await func(job, **job.kwargs)
+            job.status = JobStatus.SUCCESS
+            job.progress = 100
+        except asyncio.CancelledError:
+            job.status = JobStatus.FAILED
+            job.error = "Cancelled"
+            raise
+        except Exception:
+            job.status = JobStatus.FAILED
+            job.error = traceback.format_exc()
+        finally:
+            job.finished_at = time.time()
+            await asyncio.shield(self.save(job))
@@ -1,11 +1,14 @@
-from typing import Callable
+from http.cookies import SimpleCookie
+from typing import Callable, Optional
 
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from fastapi_admin import i18n
 
 
-async def language_processor(request: Request, call_next: Callable):
+def get_locale(request: Request) -> Optional[str]:
     locale = request.query_params.get("language")
     if not locale:
         locale = request.cookies.get("language")
@@ -15,8 +18,44 @@ async def language_processor(request: Request, call_next: Callable):
                 locale = accept_language.split(",")[0].replace("-", "_")
             else:
                 locale = None
+    return locale
+
+
+async def language_processor(request: Request, call_next: Callable):
+    locale = get_locale(request)
     i18n.set_locale(locale)
     response = await call_next(request)
     if locale:
         response.set_cookie(key="language", value=locale)
     return response
+
+
+class LanguageProcessorMiddleware:
+    """
+    Pure ASGI version of `language_processor`
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        locale = get_locale(Request(scope))
+        i18n.set_locale(locale)
+        if not locale:
+            await self.app(scope, receive, send)
+            return
+        cookie: SimpleCookie = SimpleCookie()
+        cookie["language"] = locale
+        cookie["language"]["path"] = "/"
+        cookie["language"]["samesite"] = "lax"
+        cookie_value = cookie.output(header="").strip()
+
+        async def send_with_cookie(message: Message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("set-cookie", cookie_value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
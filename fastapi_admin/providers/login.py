@@ -1,6 +1,8 @@
+import asyncio
 import typing
 import uuid
-from typing import Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Type
 
 import redis.asyncio as redis
 from fastapi import Depends, Form
@@ -8,6 +10,7 @@ from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoin
 from starlette.requests import Request
 from starlette.responses import RedirectResponse
 from starlette.status import HTTP_303_SEE_OTHER, HTTP_401_UNAUTHORIZED
+from starlette.types import ASGIApp, Receive, Scope, Send
 from tortoise import signals
 
 from fastapi_admin import constants
@@ -16,7 +19,7 @@ from fastapi_admin.i18n import _
 from fastapi_admin.models import AbstractAdmin
 from fastapi_admin.providers import Provider
 from fastapi_admin.template import templates
-from fastapi_admin.utils import check_password, hash_password
+from fastapi_admin.utils import TTLCache, check_password, hash_password
 
 if typing.TYPE_CHECKING:
     from fastapi_admin.app import FastAPIAdmin
@@ -35,13 +38,43 @@ class UsernamePasswordProvider(Provider):
         template="providers/login/login.html",
         login_title="Login to your account",
         login_logo_url: str = None,
+        admin_cache_ttl: int = 0,
+        admin_cache_size: int = 1024,
+        password_rounds: int = 12,
+        password_workers: int = 4,
     ):
+        """
+        :param admin_cache_ttl: cache authenticated admins in process for seconds, 0 to disable
+        :param admin_cache_size: max count of cached admins
+        :param password_rounds: bcrypt cost factor of new password hashes
+        :param password_workers: max count of password hashes computed at the same time
+        """
         self.login_path = login_path
         self.logout_path = logout_path
         self.template = template
         self.admin_model = admin_model
         self.login_title = login_title
         self.login_logo_url = login_logo_url
+        self.admin_cache = TTLCache(admin_cache_size, admin_cache_ttl) if admin_cache_ttl else None
+        self.password_rounds = password_rounds
+        self.password_executor = ThreadPoolExecutor(
+            max_workers=password_workers, thread_name_prefix="fastapi-admin-password"
+        )
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        """
+        Check password in the password thread pool, so bcrypt doesn't block the event loop
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.password_executor, check_password, password, password_hash
+        )
+
+    async def hash_password(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.password_executor, hash_password, password, self.password_rounds
+        )
 
     async def login_view(
         self,
@@ -62,20 +95,34 @@ class UsernamePasswordProvider(Provider):
         app.get(login_path)(self.login_view)
         app.post(login_path)(self.login)
         app.get(self.logout_path)(self.logout)
-        app.add_middleware(BaseHTTPMiddleware, dispatch=self.authenticate)
+        if app.asgi_middlewares:
+            app.add_middleware(AuthenticationMiddleware, provider=self)
+        else:
+            app.add_middleware(BaseHTTPMiddleware, dispatch=self.authenticate)
         app.get("/init")(self.init_view)
         app.post("/init")(self.init)
         app.get("/password")(self.password_view)
         app.post("/password")(self.password)
         signals.pre_save(self.admin_model)(self.pre_save_admin)
+        if self.admin_cache is not None:
+            signals.post_save(self.admin_model)(self.post_save_admin)
+            signals.post_delete(self.admin_model)(self.post_delete_admin)
 
     async def pre_save_admin(self, _, instance: AbstractAdmin, using_db, update_fields):
         if instance.pk:
             db_obj = await instance.get(pk=instance.pk)
             if db_obj.password != instance.password:
-                instance.password = hash_password(instance.password)
+                instance.password = await self.hash_password(instance.password)
         else:
-            instance.password = hash_password(instance.password)
+            instance.password = await self.hash_password(instance.password)
+
+    async def post_save_admin(self, _, instance: AbstractAdmin, created, using_db, update_fields):
+        if self.admin_cache is not None:
+            self.admin_cache.pop(str(instance.pk))
+
+    async def post_delete_admin(self, _, instance: AbstractAdmin, using_db):
+        if self.admin_cache is not None:
+            self.admin_cache.pop(str(instance.pk))
 
     async def login(self, request: Request, redis: redis.Redis = Depends(get_redis)):
         form = await request.form()
@@ -83,7 +130,7 @@ class UsernamePasswordProvider(Provider):
         password = form.get("password")
         remember_me = form.get("remember_me")
         admin = await self.admin_model.get_or_none(username=username)
-        if not admin or not check_password(password, admin.password):
+        if not admin or not await self.verify_password(password, admin.password):
             return templates.TemplateResponse(
                 self.template,
                 status_code=HTTP_401_UNAUTHORIZED,
@@ -112,21 +159,39 @@ class UsernamePasswordProvider(Provider):
         response.delete_cookie(self.access_token, path=request.app.admin_path)
         token = request.cookies.get(self.access_token)
         await request.app.redis.delete(constants.LOGIN_USER.format(token=token))
+        admin = getattr(request.state, "admin", None)
+        if self.admin_cache is not None and admin:
+            self.admin_cache.pop(str(admin.pk))
         return response
 
+    async def get_admin(self, request: Request) -> Optional[AbstractAdmin]:
+        """
+        Get admin of the access token in cookies, from the in process cache if enabled
+        """
+        token = request.cookies.get(self.access_token)
+        if not token:
+            return None
+        admin_id = await request.app.redis.get(constants.LOGIN_USER.format(token=token))
+        if admin_id is None:
+            return None
+        if isinstance(admin_id, bytes):
+            admin_id = admin_id.decode()
+        if self.admin_cache is None:
+            return await self.admin_model.get_or_none(pk=admin_id)
+        admin = self.admin_cache.get(admin_id)
+        if admin is None:
+            admin = await self.admin_model.get_or_none(pk=admin_id)
+            if admin:
+                self.admin_cache.set(admin_id, admin)
+        return admin
+
     async def authenticate(
         self,
         request: Request,
         call_next: RequestResponseEndpoint,
     ):
-        redis = request.app.redis  # type:ignore
-        token = request.cookies.get(self.access_token)
         path = request.scope["path"]
-        admin = None
-        if token:
-            token_key = constants.LOGIN_USER.format(token=token)
-            admin_id = await redis.get(token_key)
-            admin = await self.admin_model.get_or_none(pk=admin_id)
+        admin = await self.get_admin(request)
         request.state.admin = admin
 
         if path == self.login_path and admin:
@@ -192,7 +257,7 @@ class UsernamePasswordProvider(Provider):
         resources=Depends(get_resources),
     ):
         error = None
-        if not check_password(old_password, admin.password):
+        if not await self.verify_password(old_password, admin.password):
             error = _("old_password_error")
         elif new_password != re_new_password:
             error = _("new_password_different")
@@ -204,3 +269,26 @@ class UsernamePasswordProvider(Provider):
         admin.password = new_password
         await admin.save(update_fields=["password"])
         return await self.logout(request)
+
+
+class AuthenticationMiddleware:
+    """
+    Pure ASGI version of `UsernamePasswordProvider.authenticate`
+    """
+
+    def __init__(self, app: ASGIApp, provider: UsernamePasswordProvider):
+        self.app = app
+        self.provider = provider
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope, receive)
+        admin = await self.provider.get_admin(request)
+        request.state.admin = admin
+        if scope["path"] == self.provider.login_path and admin:
+            response = RedirectResponse(url=request.app.admin_path, status_code=HTTP_303_SEE_OTHER)
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
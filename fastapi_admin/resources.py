@@ -1,17 +1,29 @@
-from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import hashlib
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, validator
 from starlette.datastructures import FormData
 from starlette.requests import Request
 from tortoise import ForeignKeyFieldInstance, ManyToManyFieldInstance
 from tortoise import Model as TortoiseModel
+from tortoise.expressions import Q
 from tortoise.fields import BooleanField, DateField, DatetimeField, JSONField
 from tortoise.fields.data import CharEnumFieldInstance, IntEnumFieldInstance, IntField, TextField
 from tortoise.queryset import QuerySet
 
-from fastapi_admin.enums import Method
+from fastapi_admin import constants
+from fastapi_admin.enums import (
+    CountStrategy,
+    ExportFormat,
+    ImportFormat,
+    Method,
+    Pagination,
+    QueryMode,
+)
 from fastapi_admin.exceptions import NoSuchFieldFound
 from fastapi_admin.i18n import _
+from fastapi_admin.utils import encode_cursor
 from fastapi_admin.widgets import Widget, displays, inputs
 from fastapi_admin.widgets.filters import Filter, Search
 
@@ -47,7 +59,7 @@ class Field:
         self.label = label or name.title()
         if not display:
             display = displays.Display()
-        display.context.update(label=self.label)
+        display.context.update(label=self.label, name=name)
         self.display = display
         if not input_:
             input_ = inputs.Input()
@@ -60,12 +72,29 @@ class ComputeField(Field):
         return obj.get(self.name)
 
 
+class ModelSchema(NamedTuple):
+    """
+    Field metadata of Model resource, compiled once on first use
+    """
+
+    fields: Tuple[Field, ...]
+    input_fields: Tuple[Field, ...]
+    fields_name: Tuple[str, ...]
+    fields_label: Tuple[str, ...]
+    fk_fields: Tuple[str, ...]
+    m2m_fields: Tuple[str, ...]
+
+
 class Action(BaseModel):
     icon: str
     label: str
     name: str
     method: Method = Method.POST
     ajax: bool = True
+    background: bool = False
+    job: Optional[str] = None
+    # bulk action which handles `matching=true` for all rows of the filters instead of `ids`
+    matching: bool = False
 
     @validator("ajax")
     def ajax_validate(cls, v: bool, values: dict, **kwargs):
@@ -84,6 +113,21 @@ class Model(Resource):
     page_pre_title: Optional[str] = None
     page_title: Optional[str] = None
     filters: List[Union[str, Filter]] = []
+    pagination: Pagination = Pagination.OFFSET
+    count_strategy: CountStrategy = CountStrategy.EXACT
+    count_cache_ttl: int = 60
+    query_mode: QueryMode = QueryMode.SEQUENTIAL
+    export_formats: List[ExportFormat] = []
+    export_batch_size: int = 1000
+    import_formats: List[ImportFormat] = []
+    import_batch_size: int = 1000
+    import_max_errors: int = 100
+    bulk_delete_batch_size: int = 1000
+    bulk_delete_interval: float = 0
+    # enable conditional GET validated by pk and this field of the rows shown, list pages reuse
+    # their fetched rows and update pages query the two columns of the object
+    etag_field: Optional[str] = None
+    _schema: Optional[ModelSchema] = None
 
     async def get_toolbar_actions(self, request: Request) -> List[ToolbarAction]:
         return [
@@ -121,6 +165,7 @@ class Model(Resource):
                 icon="ti ti-trash",
                 name="delete",
                 method=Method.DELETE,
+                matching=True,
             ),
         ]
 
@@ -140,6 +185,10 @@ class Model(Resource):
                 and name in obj._meta.fk_fields
             ):
                 await obj.fetch_related(name)
+                if input_.remote:
+                    # the related object gives both label and pk of the selected option
+                    ret.append(await input_.render(request, getattr(obj, name, None)))
+                    continue
                 # Value must be the string representation of the fk obj
                 value = str(getattr(obj, name, None))
                 ret.append(await input_.render(request, value))
@@ -185,6 +234,31 @@ class Model(Resource):
                 ret[name] = value
         return ret, m2m_ret
 
+    @classmethod
+    async def resolve_import_data(cls, request: Request, row: dict):
+        """
+        Parse a row of the imported file with the inputs, relations and files are not supported
+        """
+        ret = {}
+        for field in cls.get_fields(is_display=False):
+            input_ = field.input
+            if input_.context.get("disabled") or isinstance(
+                input_, (inputs.DisplayOnly, inputs.File, inputs.ManyToMany)
+            ):
+                continue
+            name = input_.context.get("name")
+            if name not in row:
+                continue
+            v = row[name]
+            if isinstance(input_, inputs.ForeignKey):
+                ret[name] = int(v) if v is not None and v != "" else None
+                continue
+            value = await input_.parse_value(request, v)
+            if value is None:
+                continue
+            ret[name] = value
+        return ret
+
     @classmethod
     async def get_filters(cls, request: Request, values: Optional[dict] = None):
         if not values:
@@ -199,17 +273,45 @@ class Model(Resource):
         return ret
 
     @classmethod
-    def _get_fields_attr(cls, attr: str, display: bool = True):
+    def get_schema(cls) -> ModelSchema:
+        """
+        Get field metadata of the resource, which is compiled on first use and cached per class.
+        Call `clear_schema` after changing fields at runtime.
+        """
+        schema = cls.__dict__.get("_schema")
+        if schema is None:
+            fields = tuple(cls._compile_fields(is_display=True))
+            schema = ModelSchema(
+                fields=fields,
+                input_fields=tuple(cls._compile_fields(is_display=False)),
+                fields_name=tuple(cls._get_fields_attr(fields, "name")),
+                fields_label=tuple(cls._get_fields_attr(fields, "label")),
+                fk_fields=tuple(cls._get_relation_fields(cls.model._meta.fk_fields)),
+                m2m_fields=tuple(cls._get_relation_fields(cls.model._meta.m2m_fields)),
+            )
+            cls._schema = schema
+        return schema
+
+    @classmethod
+    def clear_schema(cls):
+        cls._schema = None
+
+    @classmethod
+    def _get_fields_attr(cls, fields: Tuple[Field, ...], attr: str):
         ret = []
-        for field in cls.get_fields():
-            if display and isinstance(field.display, displays.InputOnly):
+        for field in fields:
+            if isinstance(field.display, displays.InputOnly):
                 continue
             ret.append(getattr(field, attr))
         return ret or cls.model._meta.db_fields
 
     @classmethod
     def get_fields_name(cls, display: bool = True):
-        return cls._get_fields_attr("name", display)
+        """
+        Names of the display fields, `display` doesn't change them as display fields
+        never include `InputOnly` fields
+        """
+        return list(cls.get_schema().fields_name)
 
     @classmethod
     def _get_display_input_field(cls, field_name: str) -> Field:
@@ -264,6 +366,11 @@ class Model(Resource):
 
     @classmethod
     def get_fields(cls, is_display: bool = True):
+        schema = cls.get_schema()
+        return list(schema.fields if is_display else schema.input_fields)
+
+    @classmethod
+    def _compile_fields(cls, is_display: bool = True):
         ret = []
         pk_column = cls.model._meta.db_pk_column
         for field in cls.fields or cls.model._meta.fields:
@@ -289,35 +396,227 @@ class Model(Resource):
         ret.insert(0, cls._get_display_input_field(pk_column))
         return ret
 
+    @classmethod
+    def get_export_fields(cls) -> List[str]:
+        """
+        Names of the displayed fields which are columns of the model
+        """
+        db_fields = cls.model._meta.db_fields
+        # a fk field and its source column can both map to the same column
+        return list(dict.fromkeys(name for name in cls.get_fields_name() if name in db_fields))
+
+    @classmethod
+    def get_input(cls, name: str) -> Optional[inputs.Input]:
+        for field in cls.get_schema().input_fields:
+            if field.input.context.get("name") == name:
+                return field.input
+        return None
+
     @classmethod
     def get_fields_label(cls, display: bool = True):
-        return cls._get_fields_attr("label", display)
+        return list(cls.get_schema().fields_label)
 
     @classmethod
-    def get_m2m_field(cls):
+    def _get_relation_fields(cls, relation_fields: set):
         ret = []
         for field in cls.fields or cls.model._meta.fields:
             if isinstance(field, Field):
                 field = field.name
-            if field in cls.model._meta.m2m_fields:
+            if field in relation_fields:
                 ret.append(field)
         return ret
 
+    @classmethod
+    def get_m2m_field(cls):
+        return list(cls.get_schema().m2m_fields)
+
     @classmethod
     def get_fk_field(cls):
-        ret = []
-        for field in cls.fields or cls.model._meta.fields:
-            if isinstance(field, Field):
-                field = field.name
-            if field in cls.model._meta.fk_fields:
-                ret.append(field)
-        return ret
+        return list(cls.get_schema().fk_fields)
+
+    @classmethod
+    async def get_total(
+        cls, request: Request, qs: QuerySet, params: dict
+    ) -> Tuple[Optional[int], bool]:
+        """
+        Count the filtered queryset according to count_strategy.
+        :param request:
+        :param qs: filtered queryset
+        :param params: resolved filter params
+        :return: total which is None if unknown, and whether it is exact
+        """
+        if cls.count_strategy == CountStrategy.HAS_MORE:
+            return None, False
+        if cls.count_strategy == CountStrategy.ESTIMATE:
+            total = await cls.estimate_count(qs, params)
+            if total is not None:
+                return total, False
+        elif cls.count_strategy == CountStrategy.CACHED:
+            redis = request.app.redis
+            key = constants.LIST_COUNT.format(
+                resource=cls.model.__name__.lower(),
+                params=hashlib.md5(
+                    json.dumps(params, sort_keys=True, default=str).encode()
+                ).hexdigest(),
+            )
+            total = await redis.get(key)
+            if total is not None:
+                return int(total), False
+            total = await qs.count()
+            await redis.set(key, total, ex=cls.count_cache_ttl)
+            return total, True
+        return await qs.count(), True
+
+    @classmethod
+    async def get_etag(cls, request: Request, values: List[dict]) -> Optional[str]:
+        """
+        Validator of the rows shown by a page for conditional GET, None to disable it.
+        Default by pk and `etag_field` of the rows, so it must change on every save, like
+        `DatetimeField(auto_now=True)` or a version counter.
+        Changes of related objects are not tracked, override it to take them into account.
+        :param request:
+        :param values: rows of the page
+        :return:
+        """
+        if not cls.etag_field:
+            return None
+        pk_attr = cls.model._meta.pk_attr
+        return json.dumps(
+            [[value.get(pk_attr), value.get(cls.etag_field)] for value in values], default=str
+        )
+
+    @classmethod
+    def has_static_inputs(cls) -> bool:
+        """
+        Whether the form renders no options queried from database, which etag can't track
+        """
+        return not any(
+            isinstance(field.input, inputs.RelatedSelect) and not field.input.remote
+            for field in cls.get_schema().input_fields
+        )
+
+    @classmethod
+    async def estimate_count(cls, qs: QuerySet, params: dict) -> Optional[int]:
+        """
+        Estimate count of the queryset from the query planner, only postgres and mysql are supported.
+        :param qs: filtered queryset
+        :param params: resolved filter params, table statistics is used if empty
+        :return: estimated count or None if not supported
+        """
+        db = cls.model._meta.db
+        dialect = db.capabilities.dialect
+        table = cls.model._meta.db_table
+        if dialect == "postgres":
+            if not params:
+                rows = await db.execute_query_dict(
+                    "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass($1)",
+                    [table],
+                )
+                if rows and rows[0]["estimate"] >= 0:
+                    return rows[0]["estimate"]
+            rows = await db.execute_query_dict(f"EXPLAIN (FORMAT JSON) {qs.sql()}")
+            plan = rows[0]["QUERY PLAN"]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        if dialect == "mysql":
+            if not params:
+                rows = await db.execute_query_dict(
+                    "SELECT TABLE_ROWS AS estimate FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                    [table],
+                )
+                if rows and rows[0]["estimate"] is not None:
+                    return int(rows[0]["estimate"])
+            rows = await db.execute_query_dict(f"EXPLAIN {qs.sql()}")
+            return int(rows[0]["rows"] * float(rows[0].get("filtered") or 100) / 100)
+        return None
+
+    @classmethod
+    def get_keyset_ordering(cls, order_by: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Get the column and direction used by keyset pagination, pk is always the tie breaker.
+        Fallback to pk if the order_by column is unknown or nullable, which can't be seek by.
+        :param order_by:
+        :return: column name and whether it is descending
+        """
+        meta = cls.model._meta
+        desc = order_by is not None and order_by.startswith("-")
+        name = (order_by or "").lstrip("-")
+        field = meta.fields_map.get(name)
+        if not field or name not in meta.db_fields or field.null:
+            name = meta.pk_attr
+        return name, desc
+
+    @classmethod
+    def get_keyset_cursor(
+        cls, order_by: Optional[str], value: Dict[str, Any], backwards: bool = False
+    ) -> str:
+        """
+        Make the cursor pointing to the given row.
+        :param order_by:
+        :param value: row from the page
+        :param backwards: whether the cursor is used to fetch the previous page
+        :return:
+        """
+        name, _ = cls.get_keyset_ordering(order_by)
+        pk = cls.model._meta.pk_attr
+        return encode_cursor(
+            {"o": order_by or "", "b": backwards, "v": [value.get(name), value.get(pk)]}
+        )
+
+    @classmethod
+    def keyset_paginate(
+        cls, qs: QuerySet, order_by: Optional[str], cursor: Optional[dict] = None
+    ) -> Tuple[QuerySet, bool]:
+        """
+        Seek to the cursor position by order_by column and pk instead of offset.
+        :param qs:
+        :param order_by:
+        :param cursor: decoded cursor, ignored if it was made for another order_by
+        :return: ordered queryset and whether it walks backwards, rows of which should be reversed
+        """
+        name, desc = cls.get_keyset_ordering(order_by)
+        meta = cls.model._meta
+        pk = meta.pk_attr
+        position = None
+        backwards = False
+        if cursor and cursor.get("o") == (order_by or ""):
+            try:
+                value, pk_value = cursor["v"]
+                position = (
+                    meta.fields_map[name].to_python_value(value),
+                    meta.fields_map[pk].to_python_value(pk_value),
+                )
+                backwards = bool(cursor.get("b"))
+            except (KeyError, TypeError, ValueError):
+                position = None
+        reverse = desc != backwards
+        if position:
+            lookup = "lt" if reverse else "gt"
+            value, pk_value = position
+            if name == pk:
+                qs = qs.filter(**{f"{pk}__{lookup}": pk_value})
+            else:
+                qs = qs.filter(
+                    Q(**{f"{name}__{lookup}": value})
+                    | Q(**{name: value, f"{pk}__{lookup}": pk_value})
+                )
+        prefix = "-" if reverse else ""
+        ordering = [prefix + name]
+        if name != pk:
+            ordering.append(prefix + pk)
+        return qs.order_by(*ordering), backwards
 
 
 class Dropdown(Resource):
     resources: List[Type[Resource]]
 
 
+def _is_overridden(model: "Model", name: str) -> bool:
+    return getattr(type(model), name) is not getattr(Model, name)
+
+
 async def render_values(
     request: Request,
     model: "Model",
@@ -326,7 +625,7 @@ async def render_values(
     display: bool = True,
 ) -> Tuple[List[List[Any]], List[dict], List[dict], List[List[dict]]]:
     """
-    render values with template render
+    render values with template render, column by column
     :params model:
     :params request:
     :params fields:
@@ -336,26 +635,27 @@ async def render_values(
     :params model:
     :return:
     """
-    ret = []
-    cell_attributes: List[List[dict]] = []
-    row_attributes: List[dict] = []
     column_attributes: List[dict] = []
+    columns = []
     for field in fields:
         column_attributes.append(await model.column_attributes(request, field))
-    for value in values:
-        row_attributes.append(await model.row_attributes(request, value))
-        item = []
-        cell_item = []
-        for field in fields:
-            if isinstance(field, ComputeField):
-                v = await field.get_value(request, value)
-            else:
-                v = value.get(field.name)
-            cell_item.append(await model.cell_attributes(request, value, field))
-            if display:
-                item.append(await field.display.render(request, v))
-            else:
-                item.append(await field.input.render(request, v))
-        ret.append(item)
-        cell_attributes.append(cell_item)
+        if isinstance(field, ComputeField):
+            column = [await field.get_value(request, value) for value in values]
+        else:
+            column = [value.get(field.name) for value in values]
+        widget = field.display if display else field.input
+        columns.append(await widget.render_many(request, column))
+    ret = [list(row) for row in zip(*columns)]
+    # skip the hooks returning nothing unless they are overridden
+    if _is_overridden(model, "row_attributes"):
+        row_attributes = [await model.row_attributes(request, value) for value in values]
+    else:
+        row_attributes = [{} for _ in values]
+    if _is_overridden(model, "cell_attributes"):
+        cell_attributes = [
+            [await model.cell_attributes(request, value, field) for field in fields]
+            for value in values
+        ]
+    else:
+        cell_attributes = [[{} for _ in fields] for _ in values]
     return ret, row_attributes, column_attributes, cell_attributes
@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends
 
 from fastapi_admin.depends import get_current_admin
 
+from .jobs import router as jobs_router
 from .resources import router as resources_router
 
 router = APIRouter()
 router.include_router(resources_router, dependencies=[Depends(get_current_admin)])
+router.include_router(jobs_router, dependencies=[Depends(get_current_admin)])
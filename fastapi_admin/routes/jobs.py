@@ -0,0 +1,69 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Path
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.status import HTTP_404_NOT_FOUND
+
+from fastapi_admin.depends import get_model_resource, get_resources
+from fastapi_admin.resources import Model as ModelResource
+from fastapi_admin.template import templates
+
+router = APIRouter()
+
+
+@router.post("/{resource}/job/{action}")
+async def submit_job(
+    request: Request,
+    resource: str = Path(...),
+    action: str = Path(...),
+    pk: Optional[str] = None,
+    ids: Optional[str] = None,
+    model_resource: ModelResource = Depends(get_model_resource),
+):
+    """
+    Queue the job of a background action, the job function is called with resource and pks
+    """
+    jobs = request.app.jobs
+    action_ = None
+    # set by get_model_resource
+    actions = getattr(model_resource, "actions") + getattr(model_resource, "bulk_actions")
+    for a in actions:
+        if a.name == action and a.background and a.job:
+            action_ = a
+            break
+    if not jobs or not action_:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    if pk:
+        pks = [pk]
+    else:
+        pks = ids.split(",") if ids else []
+    job = await jobs.submit(action_.job, resource=resource, pks=pks)
+    return JSONResponse(
+        {
+            "job_id": job.id,
+            "url": request.app.admin_path + request.app.url_path_for("job_view", job_id=job.id),
+        }
+    )
+
+
+async def get_job(request: Request, job_id: str = Path(...)):
+    jobs = request.app.jobs
+    job = await jobs.get(job_id) if jobs else None
+    if not job:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    return job
+
+
+@router.get("/jobs/{job_id}")
+async def job_view(request: Request, job=Depends(get_job), resources=Depends(get_resources)):
+    return templates.TemplateResponse(
+        "job.html",
+        context={"request": request, "resources": resources, "job": job},
+    )
+
+
+@router.get("/jobs/{job_id}/status")
+async def job_status(job=Depends(get_job)):
+    return JSONResponse(jsonable_encoder(job.to_dict()))
@@ -1,22 +1,250 @@
-from typing import Optional
+import asyncio
+import csv
+import hashlib
+import io
+import itertools
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import IO, Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple, Type
 
-from fastapi import APIRouter, Depends, Path
-from jinja2 import TemplateNotFound
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
 from starlette.requests import Request
-from starlette.responses import RedirectResponse
-from starlette.status import HTTP_303_SEE_OTHER
+from starlette.responses import JSONResponse, RedirectResponse, Response, StreamingResponse
+from starlette.status import HTTP_303_SEE_OTHER, HTTP_304_NOT_MODIFIED, HTTP_404_NOT_FOUND
 from tortoise import Model
+from tortoise.expressions import RawSQL
 from tortoise.fields import ManyToManyRelation
+from tortoise.queryset import QuerySet
 from tortoise.transactions import in_transaction
 
 from fastapi_admin.depends import get_model, get_model_resource, get_resources
+from fastapi_admin.enums import CountStrategy, ExportFormat, ImportFormat, Pagination, QueryMode
+from fastapi_admin.i18n import _, get_locale
 from fastapi_admin.resources import Model as ModelResource
 from fastapi_admin.resources import render_values
 from fastapi_admin.responses import redirect
-from fastapi_admin.template import templates
+from fastapi_admin.template import resolve_template, templates
+from fastapi_admin.utils import decode_cursor
+from fastapi_admin.widgets import inputs
 
 router = APIRouter()
 
+WINDOW_TOTAL = "_window_total"
+
+
+async def _get_values(
+    qs: QuerySet, fk_fields: List[str], annotations: Sequence[str] = ()
+) -> List[dict]:
+    if not fk_fields:
+        return await qs.values()
+    objects = await qs.select_related(*fk_fields)
+    values = []
+    for obj in objects:
+        obj_as_dict = dict(obj)
+        for attr in (*fk_fields, *annotations):
+            obj_as_dict[attr] = getattr(obj, attr)
+        values.append(obj_as_dict)
+    return values
+
+
+def _export_value(value: Any):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _export_csv_value(value: Any):
+    value = _export_value(value)
+    if isinstance(value, (dict, list)):
+        # json columns are written as json, which import parses back
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+async def _iter_rows(
+    model_resource: ModelResource,
+    qs: QuerySet,
+    order_by: Optional[str],
+    fields: List[str],
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Fetch rows in keyset batches, so memory doesn't grow with the count of rows
+    """
+    name, _ = model_resource.get_keyset_ordering(order_by)
+    pk = model_resource.model._meta.pk_attr
+    columns = list(dict.fromkeys([*fields, name, pk]))
+    batch_size = model_resource.export_batch_size
+    cursor = None
+    while True:
+        batch_qs, _ = model_resource.keyset_paginate(qs, order_by, cursor)
+        rows = await batch_qs.limit(batch_size).values(*columns)
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            break
+        last = rows[-1]
+        cursor = {"o": order_by or "", "v": [last[name], last[pk]]}
+
+
+async def _export_csv(rows: AsyncIterator[List[Dict[str, Any]]], fields: List[str]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    yield buffer.getvalue()
+    async for batch in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_export_csv_value(row[field]) for field in fields] for row in batch)
+        yield buffer.getvalue()
+
+
+async def _export_jsonl(rows: AsyncIterator[List[Dict[str, Any]]], fields: List[str]):
+    async for batch in rows:
+        yield "".join(
+            json.dumps(
+                {field: _export_value(row[field]) for field in fields},
+                ensure_ascii=False,
+                default=str,
+            )
+            + "\n"
+            for row in batch
+        )
+
+
+ImportRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+def _read_lines(file: IO[bytes]) -> Iterator[str]:
+    for line in file:
+        yield line.decode("utf-8-sig")
+
+
+def _read_csv(file: IO[bytes]) -> Iterator[ImportRow]:
+    reader = csv.DictReader(_read_lines(file))
+    try:
+        for row in reader:
+            # empty cells are missing values
+            values = {k: v for k, v in row.items() if k is not None and v is not None and v != ""}
+            yield reader.line_num, values, None
+    except (csv.Error, UnicodeDecodeError) as e:
+        yield reader.line_num + 1, None, str(e)
+
+
+def _read_jsonl(file: IO[bytes]) -> Iterator[ImportRow]:
+    for line_num, line in enumerate(file, 1):
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            if line.strip():
+                yield line_num, None, str(e)
+            continue
+        if isinstance(row, dict):
+            yield line_num, row, None
+        else:
+            yield line_num, None, f"Expected an object, got {type(row).__name__}"
+
+
+def _take(rows: Iterator[ImportRow], size: int) -> List[ImportRow]:
+    return list(itertools.islice(rows, size))
+
+
+async def _import_rows(
+    request: Request, model_resource: ModelResource, model: Type[Model], rows: Iterator[ImportRow]
+) -> dict:
+    """
+    Parse rows in thread pool and insert them by batches, each in its own transaction.
+    Rows of a failed batch are inserted one by one to report the bad ones.
+    Model signals are not sent because of `bulk_create`.
+    """
+    result: Dict[str, Any] = {"imported": 0, "failed": 0, "errors": []}
+
+    def add_error(line: int, error: str):
+        result["failed"] += 1
+        if len(result["errors"]) < model_resource.import_max_errors:
+            result["errors"].append((line, error))
+
+    while True:
+        batch = await run_in_threadpool(_take, rows, model_resource.import_batch_size)
+        if not batch:
+            break
+        objs = []
+        for line, row, error in batch:
+            if row is not None:
+                try:
+                    data = await model_resource.resolve_import_data(request, row)
+                    objs.append((line, model(**data)))
+                    continue
+                except Exception as e:
+                    error = str(e)
+            add_error(line, error or "")
+        if not objs:
+            continue
+        try:
+            async with in_transaction() as conn:
+                await model.bulk_create([obj for _, obj in objs], using_db=conn)
+            result["imported"] += len(objs)
+        except Exception:
+            for line, obj in objs:
+                try:
+                    async with in_transaction() as conn:
+                        await model.bulk_create([obj], using_db=conn)
+                    result["imported"] += 1
+                except Exception as e:
+                    add_error(line, str(e))
+    return result
+
+
+def _get_etag(
+    request: Request, model_resource: ModelResource, validator: Optional[str]
+) -> Optional[str]:
+    """
+    Weak etag of the page, which differs by admin, locale, url and fields of the resource
+    besides the data validator
+    """
+    if validator is None:
+        return None
+    admin = getattr(request.state, "admin", None)
+    schema = model_resource.get_schema()
+    value = json.dumps(
+        [
+            validator,
+            getattr(admin, "pk", None),
+            get_locale(),
+            str(request.url),
+            schema.fields_label,
+            [field.name for field in schema.input_fields],
+        ],
+        default=str,
+    )
+    return f'W/"{hashlib.md5(value.encode()).hexdigest()}"'
+
+
+def _etag_headers(etag: Optional[str]) -> Dict[str, str]:
+    if etag is None:
+        return {}
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def _not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """
+    304 response if the etag matches If-None-Match of the request
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if etag is None or not if_none_match:
+        return None
+    tags = {tag.strip().replace("W/", "", 1) for tag in if_none_match.split(",")}
+    if "*" in tags or etag.replace("W/", "", 1) in tags:
+        return Response(status_code=HTTP_304_NOT_MODIFIED, headers=_etag_headers(etag))
+    return None
+
 
 @router.get("/{resource}/list")
 async def list_view(
@@ -28,32 +256,68 @@ async def list_view(
     page_size: int = 10,
     page_num: int = 1,
     order_by: Optional[str] = None,
+    cursor: Optional[str] = None,
 ):
     fields_label = model_resource.get_fields_label()
     fields = model_resource.get_fields()
     fk_fields = model_resource.get_fk_field()
     qs = model.all()
     params, qs = await model_resource.resolve_query_params(request, dict(request.query_params), qs)
-    filters = await model_resource.get_filters(request, params)
-    total = await qs.count()
-    if order_by:
-        qs = qs.order_by(order_by)
-    if page_size:
-        qs = qs.limit(page_size)
-    else:
+    if not page_size:
         page_size = model_resource.page_size
-    qs = qs.offset((page_num - 1) * page_size)
-    if fk_fields:
-        objects = await qs.select_related(*fk_fields)
-        values = []
-        for obj in objects:
-            obj_as_dict = dict(obj)
-            for attr in fk_fields:
-                obj_as_dict[attr] = getattr(obj, attr)
-            values.append(obj_as_dict)
+    keyset = model_resource.pagination == Pagination.KEYSET
+    backwards = False
+    if keyset:
+        page_qs, backwards = model_resource.keyset_paginate(
+            qs, order_by, decode_cursor(cursor) if cursor else None
+        )
+    else:
+        page_qs = qs.order_by(order_by) if order_by else qs
+        page_qs = page_qs.offset((page_num - 1) * page_size)
+    # fetch one more row to know if there is next page
+    page_qs = page_qs.limit(page_size + 1)
+    query_mode = model_resource.query_mode
+    if keyset and query_mode == QueryMode.WINDOW:
+        # the seek filter of keyset pages would limit the window count to rows after the cursor
+        query_mode = QueryMode.SEQUENTIAL
+    if query_mode == QueryMode.WINDOW and model_resource.count_strategy == CountStrategy.EXACT:
+        page_qs = page_qs.annotate(**{WINDOW_TOTAL: RawSQL("COUNT(*) OVER()")})
+        values = await _get_values(page_qs, fk_fields, (WINDOW_TOTAL,))
+        if values:
+            total, total_exact = values[0][WINDOW_TOTAL], True
+            for value in values:
+                value.pop(WINDOW_TOTAL)
+        else:
+            total, total_exact = await model_resource.get_total(request, qs, params)
+    elif query_mode == QueryMode.CONCURRENT:
+        (total, total_exact), values = await asyncio.gather(
+            model_resource.get_total(request, qs, params), _get_values(page_qs, fk_fields)
+        )
     else:
-        values = await qs.values()
+        total, total_exact = await model_resource.get_total(request, qs, params)
+        values = await _get_values(page_qs, fk_fields)
+    has_more = len(values) > page_size
+    values = values[:page_size]
+    next_cursor = prev_cursor = None
+    if keyset and values:
+        if backwards:
+            values.reverse()
+        if has_more or backwards:
+            next_cursor = model_resource.get_keyset_cursor(order_by, values[-1])
+        if cursor and (has_more or not backwards):
+            prev_cursor = model_resource.get_keyset_cursor(order_by, values[0], backwards=True)
 
+    # the page is validated by its rows and paging, so only rendering is skipped
+    validator = await model_resource.get_etag(request, values)
+    if validator is not None:
+        validator = json.dumps(
+            [validator, total, total_exact, has_more, next_cursor, prev_cursor], default=str
+        )
+    etag = _get_etag(request, model_resource, validator)
+    response = _not_modified(request, etag)
+    if response:
+        return response
+    filters = await model_resource.get_filters(request, params)
     (
         rendered_values,
         row_attributes,
@@ -77,21 +341,20 @@ async def list_view(
         "page_size": page_size,
         "page_num": page_num,
         "total": total,
+        "total_exact": total_exact,
+        "has_more": has_more,
+        "next_cursor": next_cursor,
+        "prev_cursor": prev_cursor,
         "from": page_size * (page_num - 1) + 1,
         "to": page_size * page_num,
         "page_title": model_resource.page_title,
         "page_pre_title": model_resource.page_pre_title,
     }
-    try:
-        return templates.TemplateResponse(
-            f"{resource}/list.html",
-            context=context,
-        )
-    except TemplateNotFound:
-        return templates.TemplateResponse(
-            "list.html",
-            context=context,
-        )
+    return templates.TemplateResponse(
+        resolve_template(resource, "list.html"),
+        context=context,
+        headers=_etag_headers(etag),
+    )
 
 
 @router.post("/{resource}/update/{pk}")
@@ -140,16 +403,10 @@ async def update(
             "page_title": model_resource.page_title,
             "page_pre_title": model_resource.page_pre_title,
         }
-        try:
-            return templates.TemplateResponse(
-                f"{resource}/update.html",
-                context=context,
-            )
-        except TemplateNotFound:
-            return templates.TemplateResponse(
-                "update.html",
-                context=context,
-            )
+        return templates.TemplateResponse(
+            resolve_template(resource, "update.html"),
+            context=context,
+        )
     return redirect(request, "list_view", resource=resource)
 
 
@@ -162,7 +419,15 @@ async def update_view(
     resources=Depends(get_resources),
     model=Depends(get_model),
 ):
-    obj = await model.get(pk=pk)
+    etag = None
+    if model_resource.etag_field and model_resource.has_static_inputs():
+        values = await model.filter(pk=pk).values(model._meta.pk_attr, model_resource.etag_field)
+        validator = await model_resource.get_etag(request, values)
+        etag = _get_etag(request, model_resource, validator)
+        response = _not_modified(request, etag)
+        if response:
+            return response
+    obj = await model.get(pk=pk).prefetch_related(*model_resource.get_m2m_field())
     inputs = await model_resource.get_inputs(request, obj)
     context = {
         "request": request,
@@ -175,16 +440,11 @@ async def update_view(
         "page_title": model_resource.page_title,
         "page_pre_title": model_resource.page_pre_title,
     }
-    try:
-        return templates.TemplateResponse(
-            f"{resource}/update.html",
-            context=context,
-        )
-    except TemplateNotFound:
-        return templates.TemplateResponse(
-            "update.html",
-            context=context,
-        )
+    return templates.TemplateResponse(
+        resolve_template(resource, "update.html"),
+        context=context,
+        headers=_etag_headers(etag),
+    )
 
 
 @router.get("/{resource}/create")
@@ -194,6 +454,13 @@ async def create_view(
     resources=Depends(get_resources),
     model_resource: ModelResource = Depends(get_model_resource),
 ):
+    etag = None
+    if model_resource.etag_field and model_resource.has_static_inputs():
+        # the form only changes with the resource definition
+        etag = _get_etag(request, model_resource, "create")
+        response = _not_modified(request, etag)
+        if response:
+            return response
     inputs = await model_resource.get_inputs(request)
     context = {
         "request": request,
@@ -205,16 +472,11 @@ async def create_view(
         "page_title": model_resource.page_title,
         "page_pre_title": model_resource.page_pre_title,
     }
-    try:
-        return templates.TemplateResponse(
-            f"{resource}/create.html",
-            context=context,
-        )
-    except TemplateNotFound:
-        return templates.TemplateResponse(
-            "create.html",
-            context=context,
-        )
+    return templates.TemplateResponse(
+        resolve_template(resource, "create.html"),
+        context=context,
+        headers=_etag_headers(etag),
+    )
 
 
 @router.post("/{resource}/create")
@@ -245,16 +507,136 @@ async def create(
         "page_title": model_resource.page_title,
         "page_pre_title": model_resource.page_pre_title,
     }
-    try:
-        return templates.TemplateResponse(
-            f"{resource}/create.html",
-            context=context,
-        )
-    except TemplateNotFound:
-        return templates.TemplateResponse(
-            "create.html",
-            context=context,
-        )
+    return templates.TemplateResponse(
+        resolve_template(resource, "create.html"),
+        context=context,
+    )
+
+
+@router.get("/{resource}/options/{field}")
+async def options_view(
+    field: str = Path(...),
+    model_resource: ModelResource = Depends(get_model_resource),
+    q: str = "",
+    offset: int = 0,
+    limit: Optional[int] = None,
+):
+    input_ = model_resource.get_input(field)
+    if not isinstance(input_, inputs.RelatedSelect):
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    if limit is not None:
+        limit = max(limit, 1)
+    results, more = await input_.search(q, max(offset, 0), limit)
+    return JSONResponse({"results": results, "more": more})
+
+
+@router.get("/{resource}/thumbnail/{field}")
+async def thumbnail(
+    field: str = Path(...),
+    model_resource: ModelResource = Depends(get_model_resource),
+    src: str = Query(...),
+    size: int = Query(...),
+):
+    input_ = model_resource.get_input(field)
+    if not isinstance(input_, inputs.File) or size not in input_.upload.thumbnail_sizes:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    if input_.upload.get_filename(src) is None:
+        # only redirect to files of the storage, not an open redirect to other sites
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    url = await input_.upload.get_thumbnail_url(src, size)
+    return RedirectResponse(url, headers={"Cache-Control": "private, max-age=86400"})
+
+
+@router.get("/{resource}/export")
+async def export(
+    request: Request,
+    resource: str = Path(...),
+    model: Model = Depends(get_model),
+    model_resource: ModelResource = Depends(get_model_resource),
+    format_: ExportFormat = Query(ExportFormat.CSV, alias="format"),
+    order_by: Optional[str] = None,
+):
+    if format_ not in model_resource.export_formats:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    _, qs = await model_resource.resolve_query_params(
+        request, dict(request.query_params), model.all()
+    )
+    fields = model_resource.get_export_fields()
+    rows = _iter_rows(model_resource, qs, order_by, fields)
+    if format_ == ExportFormat.CSV:
+        content, media_type = _export_csv(rows, fields), "text/csv"
+    else:
+        content, media_type = _export_jsonl(rows, fields), "application/x-ndjson"
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{resource}.{format_.value}"'},
+    )
+
+
+@router.get("/{resource}/import")
+async def import_view(
+    request: Request,
+    resource: str = Path(...),
+    resources=Depends(get_resources),
+    model_resource: ModelResource = Depends(get_model_resource),
+):
+    if not model_resource.import_formats:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    context = {
+        "request": request,
+        "resources": resources,
+        "resource_label": model_resource.label,
+        "resource": resource,
+        "model_resource": model_resource,
+        "page_title": model_resource.page_title,
+        "page_pre_title": model_resource.page_pre_title,
+    }
+    return templates.TemplateResponse(
+        resolve_template(resource, "import.html"),
+        context=context,
+    )
+
+
+@router.post("/{resource}/import")
+async def import_data(
+    request: Request,
+    resource: str = Path(...),
+    resources=Depends(get_resources),
+    model_resource: ModelResource = Depends(get_model_resource),
+    model: Type[Model] = Depends(get_model),
+):
+    if not model_resource.import_formats:
+        raise HTTPException(status_code=HTTP_404_NOT_FOUND)
+    form = await request.form()
+    file = form.get("file")
+    format_ = form.get("format")
+    context = {
+        "request": request,
+        "resources": resources,
+        "resource_label": model_resource.label,
+        "resource": resource,
+        "model_resource": model_resource,
+        "page_title": model_resource.page_title,
+        "page_pre_title": model_resource.page_pre_title,
+    }
+    if (
+        not isinstance(file, UploadFile)
+        or not file.filename
+        or format_ not in model_resource.import_formats
+    ):
+        context["error"] = _("invalid_import_file")
+    else:
+        if format_ == ImportFormat.CSV:
+            rows = _read_csv(file.file)
+        else:
+            rows = _read_jsonl(file.file)
+        context["result"] = await _import_rows(request, model_resource, model, rows)
+        await file.close()
+    return templates.TemplateResponse(
+        resolve_template(resource, "import.html"),
+        context=context,
+    )
 
 
 @router.delete("/{resource}/delete/{pk}")
@@ -263,7 +645,55 @@ async def delete(request: Request, pk: str, model: Model = Depends(get_model)):
     return RedirectResponse(url=request.headers.get("referer"), status_code=HTTP_303_SEE_OTHER)
 
 
+async def _delete_matching(
+    model_resource: ModelResource, model: Type[Model], qs: QuerySet, total: Optional[int]
+) -> AsyncIterator[str]:
+    """
+    Delete rows of the queryset in pk ordered chunks, with a pause between chunks,
+    and report the progress as json lines
+    """
+    pk = model._meta.pk_attr
+    batch_size = model_resource.bulk_delete_batch_size
+    deleted = 0
+    last_pk = None
+    while True:
+        chunk_qs = qs if last_pk is None else qs.filter(**{f"{pk}__gt": last_pk})
+        pks = await chunk_qs.order_by(pk).limit(batch_size).values_list(pk, flat=True)
+        if pks:
+            await model.filter(pk__in=pks).delete()
+            deleted += len(pks)
+            last_pk = pks[-1]
+        done = len(pks) < batch_size
+        yield json.dumps({"deleted": deleted, "total": total, "done": done}) + "\n"
+        if done:
+            break
+        if model_resource.bulk_delete_interval:
+            await asyncio.sleep(model_resource.bulk_delete_interval)
+
+
 @router.delete("/{resource}/delete")
-async def bulk_delete(request: Request, ids: str, model: Model = Depends(get_model)):
-    await model.filter(pk__in=ids.split(",")).delete()
+async def bulk_delete(
+    request: Request,
+    ids: Optional[str] = None,
+    matching: bool = False,
+    model: Type[Model] = Depends(get_model),
+    model_resource: ModelResource = Depends(get_model_resource),
+):
+    """
+    Delete the selected ids, or all rows matching the current filters if `matching`
+    """
+    if matching:
+        params, qs = await model_resource.resolve_query_params(
+            request, dict(request.query_params), model.all()
+        )
+        total, _ = await model_resource.get_total(request, qs, params)
+        return StreamingResponse(
+            _delete_matching(model_resource, model, qs, total),
+            media_type="application/x-ndjson",
+        )
+    pks = ids.split(",") if ids else []
+    batch_size = model_resource.bulk_delete_batch_size
+    while pks:
+        await model.filter(pk__in=pks[:batch_size]).delete()
+        pks = pks[batch_size:]
     return RedirectResponse(url=request.headers.get("referer"), status_code=HTTP_303_SEE_OTHER)
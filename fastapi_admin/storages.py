@@ -0,0 +1,117 @@
+import abc
+import os
+import uuid
+from typing import AsyncIterable, Dict, Optional
+
+import aiofiles
+import aiofiles.os
+
+
+class Storage(abc.ABC):
+    """
+    Backend where uploaded files are saved
+    """
+
+    @abc.abstractmethod
+    async def save(self, name: str, chunks: AsyncIterable[bytes]):
+        """
+        Save the content atomically, a failed save leaves nothing behind
+        :param name:
+        :param chunks: content of the file
+        """
+
+    @abc.abstractmethod
+    async def read(self, name: str) -> bytes:
+        """
+        Content of the file
+        """
+
+    @abc.abstractmethod
+    async def exists(self, name: str) -> bool:
+        """
+        Whether the file exists
+        """
+
+    @abc.abstractmethod
+    async def delete(self, name: str):
+        """
+        Delete the file if it exists
+        """
+
+    @abc.abstractmethod
+    def url(self, name: str) -> str:
+        """
+        Url of the file
+        """
+
+    def path(self, name: str) -> Optional[str]:
+        """
+        Local path of the file which other processes can open, None if it's not on local disk
+        """
+        return None
+
+
+class LocalStorage(Storage):
+    """
+    Save files in a local directory, which are written to a temp file and renamed
+    """
+
+    def __init__(self, directory: str, prefix: str = "/static/uploads"):
+        self.directory = directory
+        self.prefix = prefix
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    async def save(self, name: str, chunks: AsyncIterable[bytes]):
+        path = self.path(name)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        f = await aiofiles.open(tmp_path, "wb")
+        try:
+            async for chunk in chunks:
+                await f.write(chunk)
+        except BaseException:
+            await f.close()
+            await aiofiles.os.remove(tmp_path)
+            raise
+        await f.close()
+        await aiofiles.os.replace(tmp_path, path)
+
+    async def read(self, name: str) -> bytes:
+        async with aiofiles.open(self.path(name), "rb") as f:
+            return await f.read()
+
+    async def exists(self, name: str) -> bool:
+        return await aiofiles.os.path.exists(self.path(name))
+
+    async def delete(self, name: str):
+        if await self.exists(name):
+            await aiofiles.os.remove(self.path(name))
+
+    def url(self, name: str) -> str:
+        return os.path.join(self.prefix, name)
+
+
+class MemoryStorage(Storage):
+    """
+    Keep files in memory, a stand-in of object storages like S3 for development and tests
+    """
+
+    def __init__(self, prefix: str = "/static/uploads"):
+        self.prefix = prefix
+        self.files: Dict[str, bytes] = {}
+
+    async def save(self, name: str, chunks: AsyncIterable[bytes]):
+        self.files[name] = b"".join([chunk async for chunk in chunks])
+
+    async def read(self, name: str) -> bytes:
+        return self.files[name]
+
+    async def exists(self, name: str) -> bool:
+        return name in self.files
+
+    async def delete(self, name: str):
+        self.files.pop(name, None)
+
+    def url(self, name: str) -> str:
+        return os.path.join(self.prefix, name)
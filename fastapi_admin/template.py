@@ -1,9 +1,13 @@
+import asyncio
+import base64
 import os
 from datetime import date
-from typing import Any
+from typing import Any, Dict, Optional, Set, Tuple
 from urllib.parse import urlencode
 
-from jinja2 import pass_context
+import redis.asyncio as redis
+from jinja2 import BytecodeCache, TemplateNotFound, pass_context
+from jinja2.bccache import Bucket
 from starlette.requests import Request
 from starlette.templating import Jinja2Templates
 
@@ -36,3 +40,94 @@ def set_global_env(name: str, value: Any):
 def add_template_folder(*folders: str):
     for folder in folders:
         templates.env.loader.searchpath.insert(0, folder)
+    clear_template_cache()
+
+
+_resolved_templates: Dict[Tuple[str, str], str] = {}
+
+
+def resolve_template(resource: str, name: str) -> str:
+    """
+    Get `{resource}/{name}` if the resource overrides the template else `name`.
+    The result is cached, call `clear_template_cache` after adding template files at runtime.
+    """
+    key = (resource, name)
+    template = _resolved_templates.get(key)
+    if template is None:
+        template = f"{resource}/{name}"
+        try:
+            templates.env.get_template(template)
+        except TemplateNotFound:
+            template = name
+        _resolved_templates[key] = template
+    return template
+
+
+def clear_template_cache():
+    _resolved_templates.clear()
+
+
+def set_bytecode_cache(cache: Optional[BytecodeCache]):
+    """
+    Set bytecode cache of templates, e.g. `jinja2.FileSystemBytecodeCache` or `RedisBytecodeCache`
+    """
+    templates.env.bytecode_cache = cache
+
+
+def precompile_templates():
+    """
+    Compile all templates in template folders ahead of time
+    """
+    for name in templates.env.list_templates(extensions=["html"]):
+        templates.env.get_template(name)
+
+
+class RedisBytecodeCache(BytecodeCache):
+    """
+    Template bytecode cache stored in redis.
+
+    Jinja2 loads bytecode synchronously, so the cache is read into memory by `load` at startup
+    and new bytecode is written to redis in background.
+    """
+
+    def __init__(
+        self, redis: redis.Redis, prefix: str = "template_bytecode:", timeout: Optional[int] = None
+    ):
+        self.redis = redis
+        self.prefix = prefix
+        self.timeout = timeout
+        self._buckets: Dict[str, bytes] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def load(self):
+        keys = [key async for key in self.redis.scan_iter(match=self.prefix + "*")]
+        if not keys:
+            return
+        start = len(self.prefix)
+        for key, value in zip(keys, await self.redis.mget(keys)):
+            if value is None:
+                continue
+            if isinstance(key, bytes):
+                key = key.decode()
+            self._buckets[key[start:]] = base64.b64decode(value)
+
+    def load_bytecode(self, bucket: Bucket):
+        code = self._buckets.get(bucket.key)
+        if code is not None:
+            bucket.bytecode_from_string(code)
+
+    def dump_bytecode(self, bucket: Bucket):
+        code = bucket.bytecode_to_string()
+        self._buckets[bucket.key] = code
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(
+            self.redis.set(self.prefix + bucket.key, base64.b64encode(code), ex=self.timeout)
+        )
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def clear(self):
+        self._buckets.clear()
@@ -1,5 +1,13 @@
+import base64
+import importlib
+import json
 import random
 import string
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from datetime import time as dt_time
+from typing import Any, Optional, Tuple
 
 import bcrypt
 
@@ -15,9 +23,77 @@ def generate_random_str(
     return "".join(random.sample(all_char, length))
 
 
+def import_string(path: str) -> Any:
+    """
+    Import an attribute of a module by its dotted path, like `package.module.attr`
+    """
+    module, _, attr = path.rpartition(".")
+    return getattr(importlib.import_module(module), attr)
+
+
 def check_password(password: str, password_hash: str):
     return bcrypt.checkpw(password.encode(), password_hash.encode())
 
 
-def hash_password(password: str):
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+def hash_password(password: str, rounds: int = 12):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+
+
+def _json_default(o: Any):
+    if isinstance(o, (datetime, date, dt_time)):
+        return o.isoformat()
+    return str(o)
+
+
+def encode_cursor(data: dict) -> str:
+    """
+    Encode pagination cursor to an url safe string
+    """
+    content = json.dumps(data, default=_json_default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(content.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[dict]:
+    """
+    Decode cursor created by `encode_cursor`, return None if the cursor is invalid
+    """
+    try:
+        content = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(content)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class TTLCache:
+    """
+    Bounded LRU cache whose items expire after ttl seconds
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any, default: Any = None):
+        item = self._data.get(key)
+        if item is None:
+            return default
+        expires, value = item
+        if expires < time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Any):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
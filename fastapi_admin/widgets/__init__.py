@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, List
 
 from starlette.requests import Request
 from starlette.templating import Jinja2Templates
@@ -23,3 +23,22 @@ class Widget:
         if not self.template:
             return value
         return self.templates.get_template(self.template).render(value=value, **self.context)
+
+    async def render_many(self, request: Request, values: List[Any]) -> List[Any]:
+        """
+        Render values of a whole column, the template is loaded once for all of them.
+        Widgets overriding `render` fallback to render value by value.
+        :param request:
+        :param values:
+        :return:
+        """
+        if type(self).render is not Widget.render:
+            return [await self.render(request, value) for value in values]
+        return self._render_many(values)
+
+    def _render_many(self, values: List[Any]) -> List[Any]:
+        values = ["" if value is None else value for value in values]
+        if not self.template:
+            return values
+        template = self.templates.get_template(self.template)
+        return [template.render(value=value, **self.context) for value in values]
@@ -1,6 +1,7 @@
 import json
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
+from urllib.parse import urlencode
 
 from starlette.requests import Request
 
@@ -24,6 +25,13 @@ class DatetimeDisplay(Display):
             request, value.strftime(self.format_) if value else None
         )
 
+    async def render_many(self, request: Request, values: List[Any]) -> List[Any]:
+        if type(self).render is not DatetimeDisplay.render:
+            return await super().render_many(request, values)
+        return self._render_many(
+            [value.strftime(self.format_) if value else None for value in values]
+        )
+
 
 class DateDisplay(DatetimeDisplay):
     def __init__(self, format_: str = constants.DATE_FORMAT):
@@ -43,8 +51,32 @@ class Boolean(Display):
 class Image(Display):
     template = "widgets/displays/image.html"
 
-    def __init__(self, width: Optional[str] = None, height: Optional[str] = None):
+    def __init__(
+        self,
+        width: Optional[str] = None,
+        height: Optional[str] = None,
+        thumbnail_size: Optional[int] = None,
+    ):
+        """
+        :param thumbnail_size: show the thumbnail of this size instead of the image,
+        which must be one of `thumbnail_sizes` of the `FileUpload` of the field input,
+        and the image must be a file of its storage
+        """
         super().__init__(width=width, height=height)
+        self.thumbnail_size = thumbnail_size
+
+    def get_thumbnail_url(self, request: Request, value: str) -> str:
+        url = request.app.admin_path + request.app.url_path_for(
+            "thumbnail",
+            resource=request.path_params["resource"],
+            field=self.context.get("name"),
+        )
+        return f"{url}?{urlencode(dict(src=value, size=self.thumbnail_size))}"
+
+    async def render(self, request: Request, value: Any):
+        if value and self.thumbnail_size:
+            value = self.get_thumbnail_url(request, value)
+        return await super(Image, self).render(request, value)
 
 
 class Json(Display):
@@ -52,3 +84,8 @@ class Json(Display):
 
     async def render(self, request: Request, value: dict):
         return await super(Json, self).render(request, json.dumps(value))
+
+    async def render_many(self, request: Request, values: List[Any]) -> List[Any]:
+        if type(self).render is not Json.render:
+            return await super().render_many(request, values)
+        return self._render_many([json.dumps(value) for value in values])
@@ -1,13 +1,16 @@
 import abc
+import json
 from enum import Enum as EnumCLS
 from typing import Any, List, Optional, Tuple, Type
 
 import pendulum
+import redis.asyncio as redis
 from starlette.requests import Request
-from tortoise import Model
+from tortoise import Model, signals
 from tortoise.queryset import QuerySet
 
 from fastapi_admin import constants
+from fastapi_admin.utils import TTLCache
 from fastapi_admin.widgets.inputs import Input
 
 
@@ -101,8 +104,25 @@ class Date(Datetime):
 class Select(Filter):
     template = "widgets/filters/select.html"
 
-    def __init__(self, name: str, label: str, null: bool = True):
+    def __init__(
+        self,
+        name: str,
+        label: str,
+        null: bool = True,
+        cache_ttl: int = 0,
+        cache_in_redis: bool = False,
+    ):
+        """
+        :param cache_ttl: cache options for seconds, 0 to disable,
+            cache of model options is invalidated when the model is saved or deleted
+        :param cache_in_redis: cache options in redis of the app instead of in process
+        """
         super().__init__(name, label, null=null)
+        self.cache_ttl = cache_ttl
+        self.cache_in_redis = cache_in_redis
+        self.options_cache = TTLCache(maxsize=1, ttl=cache_ttl)
+        self._redis: Optional[redis.Redis] = None
+        self._listening = False
 
     @abc.abstractmethod
     async def get_options(self):
@@ -114,8 +134,54 @@ class Select(Filter):
         :return: list of tuple with display and value
         """
 
-    async def render(self, request: Request, value: Any):
+    def get_cache_key(self) -> str:
+        model = getattr(self, "model", None)
+        return constants.FILTER_OPTIONS.format(
+            filter=self.__class__.__name__,
+            model=model.__name__ if model else "",
+            name=self.context.get("name"),
+        )
+
+    async def get_cached_options(self, request: Request):
+        if not self.cache_ttl:
+            return await self.get_options()
+        cache_redis: Optional[redis.Redis] = request.app.redis if self.cache_in_redis else None
+        if cache_redis is not None:
+            self._redis = cache_redis
+        # saves of this process must invalidate the cache even if it was filled by others
+        self.listen_model_changes()
+        if cache_redis is not None:
+            cached = await cache_redis.get(self.get_cache_key())
+            if cached is not None:
+                return [tuple(option) for option in json.loads(cached)]
+        else:
+            options = self.options_cache.get("options")
+            if options is not None:
+                return options
         options = await self.get_options()
+        if cache_redis is not None:
+            await cache_redis.set(
+                self.get_cache_key(), json.dumps(options, default=str), ex=self.cache_ttl
+            )
+        else:
+            self.options_cache.set("options", options)
+        return options
+
+    def listen_model_changes(self):
+        model = getattr(self, "model", None)
+        if self._listening or not model:
+            return
+        signals.post_save(model)(self.invalidate_options)
+        signals.post_delete(model)(self.invalidate_options)
+        self._listening = True
+
+    async def invalidate_options(self, *args):
+        self.options_cache.clear()
+        if self._redis is not None:
+            await self._redis.delete(self.get_cache_key())
+
+    async def render(self, request: Request, value: Any):
+        options = await self.get_cached_options(request)
         self.context.update(options=options)
         return await super(Select, self).render(request, value)
 
@@ -144,8 +210,18 @@ class Enum(Select):
 
 
 class ForeignKey(Select):
-    def __init__(self, model: Type[Model], name: str, label: str, null: bool = True):
-        super().__init__(name=name, label=label, null=null)
+    def __init__(
+        self,
+        model: Type[Model],
+        name: str,
+        label: str,
+        null: bool = True,
+        cache_ttl: int = 0,
+        cache_in_redis: bool = False,
+    ):
+        super().__init__(
+            name=name, label=label, null=null, cache_ttl=cache_ttl, cache_in_redis=cache_in_redis
+        )
         self.model = model
 
     async def get_options(self):
@@ -171,8 +247,18 @@ class ForeignKey(Select):
 
 
 class DistinctColumn(Select):
-    def __init__(self, model: Type[Model], name: str, label: str, null: bool = True):
-        super().__init__(name=name, label=label, null=null)
+    def __init__(
+        self,
+        model: Type[Model],
+        name: str,
+        label: str,
+        null: bool = True,
+        cache_ttl: int = 0,
+        cache_in_redis: bool = False,
+    ):
+        super().__init__(
+            name=name, label=label, null=null, cache_ttl=cache_ttl, cache_in_redis=cache_in_redis
+        )
         self.model = model
         self.name = name
 
@@ -1,11 +1,14 @@
 import abc
 import json
 from enum import Enum as EnumCLS
-from typing import Any, List, Optional, Tuple, Type
+from typing import Any, List, Optional, Sequence, Tuple, Type
 
 from starlette.datastructures import UploadFile
 from starlette.requests import Request
 from tortoise import Model
+from tortoise.expressions import Q
+from tortoise.fields import CharField
+from tortoise.queryset import QuerySet
 
 from fastapi_admin.file_upload import FileUpload
 from fastapi_admin.widgets import Widget
@@ -89,7 +92,11 @@ class Select(Input):
         return await super(Select, self).render(request, value)
 
 
-class ForeignKey(Select):
+class RelatedSelect(Select):
+    """
+    Select of related model objects, which can fetch options from the options endpoint on demand
+    """
+
     def __init__(
         self,
         model: Type[Model],
@@ -97,10 +104,69 @@ class ForeignKey(Select):
         null: bool = False,
         disabled: bool = False,
         help_text: Optional[str] = None,
+        remote: bool = False,
+        search_fields: Optional[Sequence[str]] = None,
+        search_lookup: str = "icontains",
+        limit: int = 20,
     ):
+        """
+        :param remote: render only the current value and search options while typing
+        :param search_fields: fields searched by the options endpoint, default all char fields
+        :param search_lookup: lookup of the search, `istartswith` can use an index
+        :param limit: max count of options returned by the options endpoint at once
+        """
         super().__init__(help_text=help_text, default=default, null=null, disabled=disabled)
         self.model = model
+        self.remote = remote
+        self.search_fields = search_fields
+        self.search_lookup = search_lookup
+        self.limit = limit
+
+    def get_search_fields(self) -> List[str]:
+        if self.search_fields is None:
+            self.search_fields = [
+                name
+                for name, field in self.model._meta.fields_map.items()
+                if isinstance(field, CharField)
+            ]
+        return list(self.search_fields)
+
+    def get_search_queryset(self, q: str) -> QuerySet:
+        qs = self.model.all()
+        if q:
+            search_fields = self.get_search_fields()
+            if search_fields:
+                qs = qs.filter(
+                    Q(
+                        *[Q(**{f"{name}__{self.search_lookup}": q}) for name in search_fields],
+                        join_type=Q.OR,
+                    )
+                )
+            else:
+                qs = qs.filter(pk=q) if q.isdigit() else qs.filter(pk__in=[])
+        return qs.order_by(self.model._meta.pk_attr)
+
+    async def search(
+        self, q: str = "", offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[List[dict], bool]:
+        """
+        Search options for the options endpoint
+        :return: list of options with label and value, and whether there are more
+        """
+        limit = min(limit or self.limit, self.limit)
+        objs = await self.get_search_queryset(q).offset(offset).limit(limit + 1)
+        options = [dict(label=str(x), value=x.pk) for x in objs[:limit]]
+        return options, len(objs) > limit
+
+    def get_options_url(self, request: Request) -> str:
+        return request.app.admin_path + request.app.url_path_for(
+            "options_view",
+            resource=request.path_params["resource"],
+            field=self.context.get("name"),
+        )
+
 
+class ForeignKey(RelatedSelect):
     async def get_options(self):
         ret = await self.get_queryset()
         options = [(str(x), x.pk) for x in ret]
@@ -111,8 +177,26 @@ class ForeignKey(Select):
     async def get_queryset(self):
         return await self.model.all()
 
+    async def render(self, request: Request, value: Any):
+        if not self.remote:
+            return await super(ForeignKey, self).render(request, value)
+        if value is None:
+            value = self.default
+        options = []
+        if isinstance(value, Model):
+            options.append((str(value), value.pk))
+            value = value.pk
+        elif value is not None and value != "":
+            obj = await self.model.get_or_none(pk=value)
+            if obj:
+                options.append((str(obj), obj.pk))
+        if self.context.get("null"):
+            options = [("", "")] + options
+        self.context.update(options=options, options_url=self.get_options_url(request))
+        return await super(Select, self).render(request, value)
+
 
-class ManyToMany(Select):
+class ManyToMany(RelatedSelect):
     template = "widgets/inputs/many_to_many.html"
 
     def __init__(
@@ -120,9 +204,20 @@ class ManyToMany(Select):
         model: Type[Model],
         disabled: bool = False,
         help_text: Optional[str] = None,
+        remote: bool = False,
+        search_fields: Optional[Sequence[str]] = None,
+        search_lookup: str = "icontains",
+        limit: int = 20,
     ):
-        super().__init__(help_text=help_text, disabled=disabled)
-        self.model = model
+        super().__init__(
+            model,
+            disabled=disabled,
+            help_text=help_text,
+            remote=remote,
+            search_fields=search_fields,
+            search_lookup=search_lookup,
+            limit=limit,
+        )
 
     async def get_options(self):
         ret = await self.get_queryset()
@@ -133,8 +228,14 @@ class ManyToMany(Select):
         return await self.model.all()
 
     async def render(self, request: Request, value: Any):
+        related_objects = value.related_objects if value else []
+        if self.remote:
+            # only selected items are rendered, others are searched from the options endpoint
+            options = [dict(label=str(x), value=x.pk) for x in related_objects]
+            self.context.update(options=options, options_url=self.get_options_url(request))
+            return await super(Input, self).render(request, value)
         options = await self.get_options()
-        selected = list(map(lambda x: x.pk, value.related_objects if value else []))
+        selected = {x.pk for x in related_objects}
         for option in options:
             if option.get("value") in selected:
                 option["selected"] = True
@@ -266,8 +367,8 @@ class RadioEnum(Enum):
 class Switch(Input):
     template = "widgets/inputs/switch.html"
 
-    async def parse_value(self, request: Request, value: str):
-        if value == "on":
+    async def parse_value(self, request: Request, value: Any):
+        if value in (True, "on", "true", "True", "1"):
             return True
         return False
 